@@ -1,6 +1,13 @@
 import tkinter as tk
 from tkinter import filedialog, messagebox, simpledialog
-import subprocess, sys, os, threading, re
+import os, io, threading, re, math
+import time, json, zlib, pickle, shutil, tempfile, sqlite3, difflib
+from collections import deque, OrderedDict
+from pathlib import Path
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+import ika_core
 
 # Optional HTML preview engine
 try:
@@ -8,6 +15,664 @@ try:
 except:
     HtmlFrame = None
 
+# Optional inotify support (Linux); falls back to stat polling
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+except:
+    INotify = None
+
+
+# ==========================================================
+#              LATENCY INSTRUMENTATION (OPT-IN)
+# ==========================================================
+class LatencyMonitor:
+    """Rolling latency samples for editor handlers.
+
+    Turned on with IKA_PROFILE=1 or from Tools → Latency Instrumentation.
+    When off, no handler is wrapped, so there is no cost.
+    """
+
+    # Handlers + subsystems that get timed
+    TIMED = (
+        "_on_text_change",
+        "_highlight_syntax",
+        "_update_line_numbers",
+        "_update_html_preview",
+    )
+
+    def __init__(self, window=500, frame_budget_ms=16.0):
+        self.enabled = False
+        self.window = window
+        self.frame_budget_ms = frame_budget_ms
+        self.samples = {}
+        self.counts = {}
+        self._last_warning = 0.0
+
+    def record(self, name, ms):
+        if name not in self.samples:
+            self.samples[name] = deque(maxlen=self.window)
+            self.counts[name] = 0
+        self.samples[name].append(ms)
+        self.counts[name] += 1
+
+    @staticmethod
+    def _percentile(ordered, pct):
+        # nearest-rank percentile on an already sorted list
+        idx = max(0, min(len(ordered) - 1, math.ceil(pct / 100 * len(ordered)) - 1))
+        return ordered[idx]
+
+    def stats(self):
+        result = {}
+        for name, values in self.samples.items():
+            if not values:
+                continue
+            ordered = sorted(values)
+            result[name] = {
+                "calls": self.counts[name],
+                "last_ms": round(values[-1], 3),
+                "p50_ms": round(self._percentile(ordered, 50), 3),
+                "p95_ms": round(self._percentile(ordered, 95), 3),
+                "p99_ms": round(self._percentile(ordered, 99), 3),
+                "max_ms": round(ordered[-1], 3),
+            }
+        return result
+
+    def reset(self):
+        self.samples.clear()
+        self.counts.clear()
+
+    def dump(self, path, extra=None):
+        data = {
+            "frame_budget_ms": self.frame_budget_ms,
+            "window": self.window,
+            "handlers": self.stats(),
+        }
+        data.update(extra or {})
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+
+    def over_budget(self, ms):
+        """True when a keystroke blew the frame budget (max one warning/sec)."""
+        if ms <= self.frame_budget_ms:
+            return False
+        now = time.monotonic()
+        if now - self._last_warning < 1.0:
+            return False
+        self._last_warning = now
+        return True
+
+
+# ==========================================================
+#                  TAB BUFFER (DOCUMENT MODEL)
+# ==========================================================
+class DocumentBuffer:
+    """One open tab.
+
+    Only the active tab lives in the Text widget. Background tabs keep
+    their text zlib-compressed plus the highlight tag ranges, so switching
+    back needs no disk read and no re-highlight. Over the memory budget
+    they are evicted to disk and rehydrated on demand.
+    """
+
+    HIGHLIGHT_TAGS = ("keyword", "string", "tag")
+
+    def __init__(self, filename=None, language="Python"):
+        self.filename = filename
+        self.language = language
+        self.data = zlib.compress(b"")
+        self.spans = {}
+        self.cursor = "1.0"
+        self.yview = 0.0
+        self.modified = False
+        self.evicted_path = None
+        self.loader = None  # lazy source (session restore)
+        self.stale_highlight = False
+        self.last_used = time.monotonic()
+
+    @property
+    def title(self):
+        return os.path.basename(self.filename) if self.filename else "untitled"
+
+    def store(self, text, spans, cursor, yview, modified):
+        self.data = zlib.compress(text.encode("utf-8"), 1)
+        self.spans = spans
+        self.cursor = cursor
+        self.yview = yview
+        self.modified = modified
+        self.last_used = time.monotonic()
+
+    def text(self):
+        return zlib.decompress(self.data).decode("utf-8")
+
+    def size(self):
+        """Rough in-memory cost in bytes (0 when evicted)."""
+        if self.data is None:
+            return 0
+        return len(self.data) + sum(len(r) * 8 for r in self.spans.values())
+
+    def evict(self, folder):
+        self.evicted_path = os.path.join(folder, f"tab_{id(self)}.bin")
+        with open(self.evicted_path, "wb") as f:
+            pickle.dump((self.data, self.spans), f)
+        self.data = None
+        self.spans = None
+
+    def payload(self):
+        """(data, spans) wherever they currently live, without moving them."""
+        if self.evicted_path is not None:
+            with open(self.evicted_path, "rb") as f:
+                return pickle.load(f)
+        return self.data, self.spans
+
+    def rehydrate(self):
+        if self.loader is not None:
+            self.data, self.spans, self.stale_highlight = self.loader()
+            self.loader = None
+            return
+        if self.evicted_path is None:
+            return
+        with open(self.evicted_path, "rb") as f:
+            self.data, self.spans = pickle.load(f)
+        os.remove(self.evicted_path)
+        self.evicted_path = None
+
+
+# ==========================================================
+#                 SESSION SNAPSHOT (SQLITE)
+# ==========================================================
+class SessionStore:
+    """Versioned single-file session snapshot.
+
+    Tab rows keep their (compressed) text and highlight spans in BLOB
+    columns, so startup reads only the small index first and pulls each
+    tab's payload when it is needed.
+    """
+
+    VERSION = 1
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+        CREATE TABLE IF NOT EXISTS tabs (
+            position INTEGER PRIMARY KEY,
+            filename TEXT, language TEXT, cursor TEXT, yview REAL,
+            modified INTEGER, mtime REAL, size INTEGER,
+            data BLOB, spans BLOB
+        );
+        CREATE TABLE IF NOT EXISTS chunks (position INTEGER PRIMARY KEY, text TEXT);
+        CREATE TABLE IF NOT EXISTS snippets (
+            language TEXT PRIMARY KEY, signature TEXT, snippets TEXT
+        );
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path)
+        conn.executescript(self.SCHEMA)
+        return conn
+
+    def save(self, tabs, active, chunks, snippets):
+        conn = self._connect()
+        try:
+            with conn:
+                for table in ("meta", "tabs", "chunks", "snippets"):
+                    conn.execute(f"DELETE FROM {table}")
+                conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                    ("version", str(self.VERSION)),
+                    ("active", str(active)),
+                    ("saved", str(time.time())),
+                ])
+                conn.executemany(
+                    "INSERT INTO tabs VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (i, t["filename"], t["language"], t["cursor"], t["yview"],
+                         int(t["modified"]), t["mtime"], t["size"],
+                         t["data"], zlib.compress(json.dumps(t["spans"]).encode("utf-8")))
+                        for i, t in enumerate(tabs)
+                    ]
+                )
+                conn.executemany("INSERT INTO chunks VALUES (?, ?)", list(enumerate(chunks)))
+                conn.executemany("INSERT INTO snippets VALUES (?, ?, ?)", [
+                    (lang, json.dumps(sig), json.dumps(snips))
+                    for lang, (sig, snips) in snippets.items()
+                ])
+        finally:
+            conn.close()
+
+    def load_index(self):
+        """Everything except tab payloads, or None if there is no usable session."""
+        if not os.path.exists(self.path):
+            return None
+
+        conn = self._connect()
+        try:
+            meta = dict(conn.execute("SELECT key, value FROM meta"))
+            if meta.get("version") != str(self.VERSION):
+                return None
+
+            tabs = [
+                {
+                    "position": row[0], "filename": row[1], "language": row[2],
+                    "cursor": row[3], "yview": row[4], "modified": bool(row[5]),
+                    "mtime": row[6], "size": row[7],
+                }
+                for row in conn.execute(
+                    "SELECT position, filename, language, cursor, yview, modified, mtime, size "
+                    "FROM tabs ORDER BY position"
+                )
+            ]
+            chunks = [row[0] for row in conn.execute("SELECT text FROM chunks ORDER BY position")]
+            snippets = {
+                lang: (tuple(tuple(s) for s in json.loads(sig)), json.loads(snips))
+                for lang, sig, snips in conn.execute("SELECT language, signature, snippets FROM snippets")
+            }
+        finally:
+            conn.close()
+
+        if not tabs:
+            return None
+        return tabs, int(meta.get("active", 0)), chunks, snippets
+
+    def load_payload(self, position):
+        conn = sqlite3.connect(self.path)
+        try:
+            data, spans = conn.execute(
+                "SELECT data, spans FROM tabs WHERE position = ?", (position,)
+            ).fetchone()
+        finally:
+            conn.close()
+
+        spans = {tag: tuple(r) for tag, r in json.loads(zlib.decompress(spans)).items()}
+        return data, spans
+
+
+# ==========================================================
+#                EXTERNAL FILE-CHANGE DETECTION
+# ==========================================================
+class FileWatcher:
+    """Notices open files being rewritten by other tools.
+
+    With inotify the parent folders are watched and only files named in
+    events get stat'ed; otherwise every watched file is stat'ed on each
+    poll. Either way a file only counts as changed when its cached
+    (mtime, size) differs, so our own saves are ignored after touch().
+    """
+
+    def __init__(self):
+        self.known = {}
+        self._inotify = None
+        self._dirs = {}   # folder -> watch descriptor
+        self._wd_dirs = {}
+
+        if INotify is not None:
+            try:
+                self._inotify = INotify()
+            except OSError:
+                self._inotify = None
+
+    @staticmethod
+    def signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def watch(self, path):
+        self.known[path] = self.signature(path)
+
+        folder = os.path.dirname(os.path.abspath(path))
+        if self._inotify is not None and folder not in self._dirs:
+            mask = inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO | inotify_flags.CREATE
+            try:
+                wd = self._inotify.add_watch(folder, mask)
+            except OSError:
+                return
+            self._dirs[folder] = wd
+            self._wd_dirs[wd] = folder
+
+    def unwatch(self, path):
+        self.known.pop(path, None)
+
+        folder = os.path.dirname(os.path.abspath(path))
+        still_used = any(os.path.dirname(os.path.abspath(p)) == folder for p in self.known)
+        if self._inotify is not None and folder in self._dirs and not still_used:
+            wd = self._dirs.pop(folder)
+            self._wd_dirs.pop(wd, None)
+            try:
+                self._inotify.rm_watch(wd)
+            except OSError:
+                pass
+
+    def touch(self, path):
+        """Accept the file's current state as known (after load/save)."""
+        if path in self.known:
+            self.known[path] = self.signature(path)
+
+    def poll(self):
+        """Paths whose contents changed since they were last seen."""
+        if self._inotify is not None:
+            touched = set()
+            for event in self._inotify.read(timeout=0):
+                folder = self._wd_dirs.get(event.wd)
+                if folder:
+                    touched.add(os.path.join(folder, event.name))
+            candidates = [p for p in self.known if os.path.abspath(p) in touched]
+        else:
+            candidates = list(self.known)
+
+        changed = []
+        for path in candidates:
+            sig = self.signature(path)
+            if sig is not None and sig != self.known[path]:
+                self.known[path] = sig
+                changed.append(path)
+        return changed
+
+
+# ==========================================================
+#                 UNDO HISTORY (MEMORY-BOUNDED)
+# ==========================================================
+class UndoUnit:
+    """One undo step: a list of [kind, index, payload] edits."""
+
+    def __init__(self, now):
+        self.edits = []
+        self.last_time = now
+        self.next_index = None  # where contiguous typing would continue
+        self.size = 0
+
+    def measure(self):
+        self.size = sum(len(e[2]) + 64 for e in self.edits)
+        return self.size
+
+
+class UndoHistory:
+    """Undo/redo for the editor, replacing Tk's unlimited built-in stack.
+
+    Typing is grouped into word-sized units (or whatever is typed within
+    GROUP_SECONDS), a delete + insert at the same spot is stored as one
+    replace with the shared prefix/suffix trimmed off, and big payloads
+    are zlib-compressed. Past budget bytes the oldest units are dropped.
+    """
+
+    GROUP_SECONDS = 1.0
+    COMPRESS_OVER = 4096
+
+    def __init__(self, budget, offset_index):
+        self.budget = budget
+        self.offset_index = offset_index  # (index, nchars) -> index
+        self.undo_stack = deque()
+        self.redo_stack = []
+        self.current = None
+        self.paused = False
+        self.grouped = False  # True → every edit joins the open unit
+        self.evicted = 0
+        self._stored = 0  # bytes in sealed units (undo + redo)
+
+    @staticmethod
+    def text_of(payload):
+        return zlib.decompress(payload).decode("utf-8") if isinstance(payload, bytes) else payload
+
+    @staticmethod
+    def _advance(index, text):
+        line, col = map(int, index.split("."))
+        parts = text.split("\n")
+        if len(parts) == 1:
+            return f"{line}.{col + len(text)}"
+        return f"{line + len(parts) - 1}.{len(parts[-1])}"
+
+    def record(self, kind, index, text, end=None):
+        if self.paused:
+            return
+
+        now = time.monotonic()
+        unit = self.current
+        last = unit.edits[-1] if unit else None
+        recent = unit is not None and now - unit.last_time < self.GROUP_SECONDS
+
+        if self.redo_stack:
+            self._stored -= sum(u.size for u in self.redo_stack)
+            self.redo_stack.clear()
+
+        if self.grouped and unit is not None:
+            unit.edits.append([kind, index, text])
+            unit.last_time = now
+            return
+
+        if recent and kind == "insert" and last[0] == "insert" and index == unit.next_index:
+            typed = last[2]
+            # new word after whitespace → new unit
+            if not (typed[-1:].isspace() and not text[:1].isspace()):
+                last[2] = typed + text
+                unit.next_index = self._advance(index, text)
+                unit.last_time = now
+                return
+
+        elif recent and kind == "delete" and last[0] == "delete" and len(text) == 1:
+            if end == last[1]:          # backspace
+                last[1] = index
+                last[2] = text + last[2]
+                unit.last_time = now
+                return
+            if index == last[1]:        # forward delete
+                last[2] = last[2] + text
+                unit.last_time = now
+                return
+
+        elif recent and kind == "insert" and last[0] == "delete" and index == last[1]:
+            # typing over a selection / replace: same unit
+            unit.edits.append(["insert", index, text])
+            unit.next_index = self._advance(index, text)
+            unit.last_time = now
+            return
+
+        self.separator()
+        unit = self.current = UndoUnit(now)
+        unit.edits.append([kind, index, text])
+        if kind == "insert":
+            unit.next_index = self._advance(index, text)
+
+    def separator(self):
+        """Close the open unit (compact it and apply the budget)."""
+        unit = self.current
+        if unit is None:
+            return
+        self.current = None
+
+        self._compact(unit)
+        if not unit.edits:
+            return  # text replaced with identical text, nothing to undo
+        self._stored += unit.measure()
+        self.undo_stack.append(unit)
+
+        while self._stored > self.budget and self.undo_stack:
+            self._stored -= self.undo_stack.popleft().size
+            self.evicted += 1
+
+    def _compact(self, unit):
+        edits = unit.edits
+        if len(edits) == 2 and edits[0][0] == "delete" and edits[1][0] == "insert" \
+                and edits[0][1] == edits[1][1]:
+            old, new = edits[0][2], edits[1][2]
+
+            limit = min(len(old), len(new))
+            head = 0
+            while head < limit and old[head] == new[head]:
+                head += 1
+            tail = 0
+            while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+                tail += 1
+
+            if head:
+                index = self.offset_index(edits[0][1], head)
+                edits[0][1] = edits[1][1] = index
+            edits[0][2] = old[head:len(old) - tail]
+            edits[1][2] = new[head:len(new) - tail]
+            unit.edits = [e for e in edits if e[2]]
+
+        for e in unit.edits:
+            if len(e[2]) > self.COMPRESS_OVER:
+                e[2] = zlib.compress(e[2].encode("utf-8"), 6)
+
+    def reset(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
+        self.current = None
+        self._stored = 0
+
+    def pop_undo(self):
+        self.separator()
+        if not self.undo_stack:
+            return None
+        unit = self.undo_stack.pop()
+        self.redo_stack.append(unit)
+        return unit
+
+    def pop_redo(self):
+        self.separator()
+        if not self.redo_stack:
+            return None
+        unit = self.redo_stack.pop()
+        self.undo_stack.append(unit)
+        return unit
+
+    def memory(self):
+        open_bytes = sum(len(e[2]) + 64 for e in self.current.edits) if self.current else 0
+        return self._stored + open_bytes
+
+
+# ==========================================================
+#               HTML PREVIEW RESOURCE CACHE (LRU)
+# ==========================================================
+class PreviewResourceCache:
+    """Images and stylesheets for the live preview, kept ready in memory.
+
+    The page text is loaded unchanged with a file:// base URL, so tkinterweb
+    resolves <img>, <link> and CSS url() references itself. Its requests
+    for local files are answered from here: image() is Tkhtml's -imagecmd
+    and returns an already decoded PhotoImage, request() sits in front of
+    the widget's download_url and returns stylesheet text. Entries are
+    keyed by path and checked against (mtime, size); the least recently
+    used ones go once budget bytes are exceeded. Entries requested by the
+    current load are never evicted, and dropped images are only deleted at
+    the next load, since Tkhtml may still be showing them until then.
+    """
+
+    def __init__(self, budget=32 * 1024 * 1024):
+        self.budget = budget
+        self.entries = OrderedDict()  # (kind, path) -> (signature, value, cost_ms, nbytes)
+        self.used = 0
+        self.pinned = set()   # keys requested since begin_refresh()
+        self.retired = []     # dropped PhotoImages, deleted on the next load
+        self.last_refresh = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+
+    @staticmethod
+    def base_url(folder):
+        """file:// URL relative references in a page in folder resolve against."""
+        return Path(folder).resolve().as_uri() + "/"
+
+    @staticmethod
+    def local_path(url):
+        parts = urlparse(url)
+        if parts.scheme != "file" or parts.netloc not in ("", "localhost"):
+            return None
+        path = url2pathname(parts.path)
+        return path if os.path.isfile(path) else None
+
+    def begin_refresh(self):
+        """Start a new preview load: free retired images, reset pins and counts."""
+        for img in self.retired:
+            img.tk.call("image", "delete", img.name)
+        self.retired = []
+        self.pinned.clear()
+        self.last_refresh = {"hits": 0, "misses": 0, "saved_ms": 0.0}
+
+    def _get(self, kind, path, load):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        signature = (st.st_mtime_ns, st.st_size)
+        key = (kind, path)
+        stats = self.last_refresh
+        self.pinned.add(key)
+
+        entry = self.entries.get(key)
+        if entry and entry[0] == signature:
+            self.entries.move_to_end(key)
+            stats["hits"] += 1
+            stats["saved_ms"] += entry[2]
+            return entry[1]
+
+        start = time.perf_counter()
+        try:
+            value, nbytes = load(path)
+        except (OSError, UnicodeDecodeError, tk.TclError):
+            return None
+        cost_ms = (time.perf_counter() - start) * 1000
+
+        if entry:
+            self._drop(key)
+        self.entries[key] = (signature, value, cost_ms, nbytes)
+        self.used += nbytes
+        stats["misses"] += 1
+
+        # The current page may go over budget; it is trimmed on a later load
+        for old in [k for k in self.entries if k not in self.pinned]:
+            if self.used <= self.budget:
+                break
+            self._drop(old)
+
+        return value
+
+    def _drop(self, key):
+        _, value, _, nbytes = self.entries.pop(key)
+        self.used -= nbytes
+        if key[0] == "img":
+            self.retired.append(value)
+
+    def image(self, url, master):
+        """Decoded PhotoImage for a local image URL, or None if Tk can't read it."""
+        path = self.local_path(url)
+        if not path:
+            return None
+
+        def load(path):
+            img = tk.PhotoImage(master=master, file=path)
+            return img, img.width() * img.height() * 4
+
+        return self._get("img", path, load)
+
+    def request(self, url, data="", method="GET", decode=None):
+        """(url, text, type, code) for a local stylesheet, else None."""
+        path = self.local_path(url) if method == "GET" and not data else None
+        if path and path.lower().endswith(".css"):
+            def load(path):
+                with open(path, "r", encoding=decode or "utf-8") as f:
+                    text = f.read()
+                return text, len(text)
+
+            text = self._get("css", path, load)
+            if text is not None:
+                return url, text, "text/css", 200
+        return None
+
+    def report(self):
+        s = self.last_refresh
+        total = s["hits"] + s["misses"]
+        rate = (s["hits"] / total * 100) if total else 0.0
+        return {
+            "hits": s["hits"],
+            "misses": s["misses"],
+            "hit_rate_pct": round(rate, 1),
+            "saved_ms": round(s["saved_ms"], 3),
+            "cached_files": len(self.entries),
+            "cached_bytes": self.used,
+            "budget_bytes": self.budget,
+        }
+
 
 class MiniIDLE(tk.Tk):
     def __init__(self):
@@ -28,6 +693,26 @@ class MiniIDLE(tk.Tk):
         self.image_window = None
         self.image_listbox = None
         self.image_folder = None
+        self.latency = LatencyMonitor()
+        self.latency_var = None
+        self.stats_window = None
+        self.buffers = []
+        self.active_buffer = None
+        self.tab_bar = None
+        self._tab_cache_dir = None
+        self.TAB_MEMORY_BUDGET = 8 * 1024 * 1024  # bytes for background tabs
+        self.saved_chunks = []
+        self._snippet_cache = {}
+        self.session = SessionStore(os.path.join(os.getcwd(), "ika_session.db"))
+        self.SESSION_AUTOSAVE_MS = 60 * 1000
+        self.watcher = FileWatcher()
+        self.preview_cache = PreviewResourceCache()
+        self.UNDO_MEMORY_BUDGET = 4 * 1024 * 1024  # bytes of undo/redo history
+        self.undo_history = UndoHistory(
+            self.UNDO_MEMORY_BUDGET,
+            lambda index, n: self.text.index(f"{index}+{n}c")
+        )
+        self.WATCH_POLL_MS = 300 if self.watcher._inotify else 1000
 
         # Snippet folders
         self.snippet_folder = os.path.join(os.getcwd(), "snippets")
@@ -35,23 +720,8 @@ class MiniIDLE(tk.Tk):
         os.makedirs(os.path.join(self.snippet_folder, "python"), exist_ok=True)
         os.makedirs(os.path.join(self.snippet_folder, "html"), exist_ok=True)
 
-        # Built-in snippets
-        self.BUILTIN_SNIPPETS = {
-            "python": {
-                "forloop": "for i in range():\n    pass\n",
-                "func": "def function_name():\n    pass\n",
-                "class": "class NewClass:\n    def __init__(self):\n        pass\n"
-            },
-            "html": {
-                "div": "<div></div>",
-                "h1": "<h1>Title</h1>",
-                "button": "<button>Click</button>",
-                "page": (
-                    "<!DOCTYPE html>\n<html>\n<head>\n<title>New Page</title>\n</head>\n"
-                    "<body>\n\n</body>\n</html>"
-                )
-            }
-        }
+        # Built-in snippets (shared with the CLI)
+        self.BUILTIN_SNIPPETS = ika_core.BUILTIN_SNIPPETS
 
         # Theme colors
         self.COLOR_BG = "#111111"
@@ -72,9 +742,19 @@ class MiniIDLE(tk.Tk):
         # Build UI
         self._create_widgets()
         self._create_menu()
+        self._add_buffer(DocumentBuffer())
+        self._restore_session()
+        self.after(self.SESSION_AUTOSAVE_MS, self._autosave_session)
+        self.protocol("WM_DELETE_WINDOW", self.destroy)
+        self.after(self.WATCH_POLL_MS, self._poll_file_changes)
 
         self.append_output("FysonWorks – Caleb's IDLE ready.\n")
 
+        # Opt-in latency instrumentation
+        if os.environ.get("IKA_PROFILE") == "1":
+            self.latency_var.set(True)
+            self.set_latency_enabled(True)
+
     # ======================================================
     #                 OUTPUT + LOGGING
     # ======================================================
@@ -108,40 +788,35 @@ class MiniIDLE(tk.Tk):
     # ======================================================
     #              SYNTAX HIGHLIGHT (BASIC)
     # ======================================================
-    def _highlight_syntax(self):
-        self.text.tag_remove("keyword", "1.0", tk.END)
-        self.text.tag_remove("string", "1.0", tk.END)
-        self.text.tag_remove("tag", "1.0", tk.END)
+    def _highlight_syntax(self, first="1.0", last=tk.END):
+        # first/last limit the pass to a line range (used by diff reloads)
+        self.text.tag_remove("keyword", first, last)
+        self.text.tag_remove("string", first, last)
+        self.text.tag_remove("tag", first, last)
 
-        content = self.text.get("1.0", tk.END)
+        content = self.text.get(first, last)
 
         # Python
         if self.current_language == "Python":
             keywords = r"\b(def|class|for|while|if|elif|else|try|except|return|import|from|as|with|pass|in|not|and|or)\b"
             for match in re.finditer(keywords, content):
-                start = f"1.0+{match.start()}c"
-                end = f"1.0+{match.end()}c"
+                start = f"{first}+{match.start()}c"
+                end = f"{first}+{match.end()}c"
                 self.text.tag_add("keyword", start, end)
 
-            self.text.tag_config("keyword", foreground="#5ea2ff")
-
             # strings
             for match in re.finditer(r"(\".*?\"|\'.*?\')", content):
-                start = f"1.0+{match.start()}c"
-                end = f"1.0+{match.end()}c"
+                start = f"{first}+{match.start()}c"
+                end = f"{first}+{match.end()}c"
                 self.text.tag_add("string", start, end)
 
-            self.text.tag_config("string", foreground="#ffcc66")
-
         # HTML
         if self.current_language == "HTML":
             for match in re.finditer(r"<[^>]+>", content):
-                start = f"1.0+{match.start()}c"
-                end = f"1.0+{match.end()}c"
+                start = f"{first}+{match.start()}c"
+                end = f"{first}+{match.end()}c"
                 self.text.tag_add("tag", start, end)
 
-            self.text.tag_config("tag", foreground="#66d9ef")
-
     # ======================================================
     #           HTML PREVIEW UPDATE HANDLING
     # ======================================================
@@ -158,8 +833,12 @@ class MiniIDLE(tk.Tk):
         html_code = self.text.get("1.0", tk.END)
 
         if HtmlFrame:
+            # Relative assets resolve next to the file (or the working folder)
+            folder = os.path.dirname(os.path.abspath(self._filename)) if self._filename else os.getcwd()
+            self.preview_cache.begin_refresh()
+
             try:
-                self.preview_widget.load_html(html_code)
+                self.preview_widget.load_html(html_code, base_url=self.preview_cache.base_url(folder))
             except:
                 pass  # ignore preview errors
         else:
@@ -168,6 +847,35 @@ class MiniIDLE(tk.Tk):
             self.preview_widget.insert("1.0", html_code)
             self.preview_widget.config(state="disabled")
 
+    def _hook_preview_resources(self):
+        """Route the preview's image and stylesheet requests through the cache.
+
+        Local images come back as cached PhotoImages (no delete script, the
+        cache owns them) and local CSS as cached text. Anything else goes to
+        tkinterweb's own handlers, so its URL cache, headers, SSL and timeout
+        settings still apply.
+        """
+        html = self.preview_widget.html
+        download_url = html.download_url
+
+        def download(url, *args):
+            return self.preview_cache.request(url, *args) or download_url(url, *args)
+
+        html.download_url = download
+
+        try:
+            fallback = self.tk.call(html, "cget", "-imagecmd")
+        except tk.TclError:
+            return
+
+        def image_cmd(url):
+            img = self.preview_cache.image(html.resolve_url(url), html)
+            if img is None:
+                return self.tk.call(fallback, url)
+            return img.name
+
+        self.tk.call(html, "configure", "-imagecmd", self.register(image_cmd))
+
     # ======================================================
     #        MAIN TEXT-CHANGE EVENT (HIGHLIGHT + PREVIEW)
     # ======================================================
@@ -185,11 +893,7 @@ class MiniIDLE(tk.Tk):
     #                     FILE OPERATIONS
     # ======================================================
     def new_file(self):
-        self.text.delete("1.0", tk.END)
-        self._filename = None
-        self.current_language = "Python"
-        self.title("FysonWorks – Caleb's IDLE (Python)")
-        self._update_preview_visibility()
+        self._add_buffer(DocumentBuffer())
         self.append_output("New file created.\n")
 
     def open_file(self):
@@ -203,22 +907,36 @@ class MiniIDLE(tk.Tk):
         if not path:
             return
 
+        # Already open → just switch tabs (no reload, no re-highlight)
+        for buf in self.buffers:
+            if buf.filename and os.path.abspath(buf.filename) == os.path.abspath(path):
+                self.switch_tab(buf)
+                return
+
         with open(path, "r", encoding="utf-8") as f:
             text = f.read()
 
+        # Reuse an untouched empty tab, otherwise open a new one
+        if self._filename or self.text.edit_modified() or self.text.get("1.0", "end-1c"):
+            self._add_buffer(DocumentBuffer(path))
+
+        self.undo_history.paused = True
         self.text.delete("1.0", tk.END)
         self.text.insert("1.0", text)
+        self.undo_history.paused = False
         self._filename = path
 
-        if path.endswith(".html"):
-            self.current_language = "HTML"
-        else:
-            self.current_language = "Python"
+        self.current_language = ika_core.language_for(path)
 
         self.title(f"FysonWorks – Caleb's IDLE ({self.current_language})")
         self._update_preview_visibility()
         self._highlight_syntax()
         self._update_line_numbers()
+        self.undo_history.reset()
+        self.text.edit_modified(False)
+        self.active_buffer.filename = path
+        self.watcher.watch(path)
+        self._render_tabs()
         self.append_output(f"Opened: {path}\n")
 
     def save_file(self):
@@ -228,6 +946,10 @@ class MiniIDLE(tk.Tk):
         with open(self._filename, "w", encoding="utf-8") as f:
             f.write(self.text.get("1.0", tk.END))
 
+        self.text.edit_modified(False)
+        self.active_buffer.filename = self._filename
+        self.watcher.touch(self._filename)
+        self._render_tabs()
         self.append_output(f"Saved: {self._filename}\n")
 
     def save_file_as(self):
@@ -240,6 +962,497 @@ class MiniIDLE(tk.Tk):
         self._filename = path
         self.save_file()
 
+    # ======================================================
+    #                     TABBED BUFFERS
+    # ======================================================
+    def _capture_spans(self):
+        return {
+            tag: tuple(str(i) for i in self.text.tag_ranges(tag))
+            for tag in DocumentBuffer.HIGHLIGHT_TAGS
+        }
+
+    def _active_state(self):
+        return (
+            self.text.get("1.0", "end-1c"),
+            self._capture_spans(),
+            self.text.index(tk.INSERT),
+            self.text.yview()[0],
+            bool(self.text.edit_modified())
+        )
+
+    def _snapshot_active(self):
+        """Move the live widget state into the active buffer's model."""
+        buf = self.active_buffer
+        if buf is None:
+            return
+
+        buf.filename = self._filename
+        buf.language = self.current_language
+        buf.store(*self._active_state())
+
+    def _load_buffer(self, buf):
+        buf.rehydrate()
+
+        self._filename = buf.filename
+        self.current_language = buf.language
+
+        self.undo_history.paused = True
+        self.text.delete("1.0", tk.END)
+        self.text.insert("1.0", buf.text())
+        self.undo_history.paused = False
+
+        # Saved highlight state – one tag_add per tag, no regex pass
+        for tag, ranges in buf.spans.items():
+            if ranges:
+                self.text.tag_add(tag, *ranges)
+
+        self.text.mark_set(tk.INSERT, buf.cursor)
+        self.text.yview_moveto(buf.yview)
+        self.undo_history.reset()
+        self.text.edit_modified(buf.modified)
+
+        # The widget holds the text now
+        buf.data = zlib.compress(b"")
+        buf.spans = {}
+        buf.last_used = time.monotonic()
+
+        self.title(f"FysonWorks – Caleb's IDLE ({self.current_language})")
+        self._update_preview_visibility()
+        self._update_line_numbers()
+
+        if buf.stale_highlight:
+            buf.stale_highlight = False
+            self._highlight_syntax()
+
+        # Drop the previous tab's throttled refresh and show this tab's page
+        if self._preview_after:
+            self.after_cancel(self._preview_after)
+            self._preview_after = None
+        if self.current_language == "HTML":
+            self._update_html_preview()
+
+    def _add_buffer(self, buf):
+        self._snapshot_active()
+        self.buffers.append(buf)
+        self.active_buffer = buf
+        self._load_buffer(buf)
+        self._enforce_tab_budget()
+        self._render_tabs()
+
+    def switch_tab(self, buf):
+        if buf is self.active_buffer:
+            return
+
+        self._snapshot_active()
+        self.active_buffer = buf
+        self._load_buffer(buf)
+        self._enforce_tab_budget()
+        self._render_tabs()
+
+    def close_tab(self, buf=None, ask=True):
+        buf = buf or self.active_buffer
+        is_active = buf is self.active_buffer
+        modified = self.text.edit_modified() if is_active else buf.modified
+
+        if ask and modified and not messagebox.askyesno(
+            "Close Tab", f"'{buf.title}' has unsaved changes. Close anyway?"
+        ):
+            return
+
+        if buf.evicted_path and os.path.exists(buf.evicted_path):
+            os.remove(buf.evicted_path)
+
+        index = self.buffers.index(buf)
+        self.buffers.remove(buf)
+
+        if not is_active:
+            self._render_tabs()
+        elif self.buffers:
+            self.active_buffer = self.buffers[max(0, index - 1)]
+            self._load_buffer(self.active_buffer)
+            self._render_tabs()
+        else:
+            self.active_buffer = None
+            self._add_buffer(DocumentBuffer())
+
+    def _enforce_tab_budget(self):
+        """Evict least-recently-used background tabs to disk."""
+        background = [b for b in self.buffers if b is not self.active_buffer and b.data is not None]
+        used = sum(b.size() for b in background)
+
+        for buf in sorted(background, key=lambda b: b.last_used):
+            if used <= self.TAB_MEMORY_BUDGET:
+                break
+            if self._tab_cache_dir is None:
+                self._tab_cache_dir = tempfile.mkdtemp(prefix="ika_tabs_")
+            used -= buf.size()
+            buf.evict(self._tab_cache_dir)
+
+    def _render_tabs(self):
+        for child in self.tab_bar.winfo_children():
+            child.destroy()
+
+        for buf in self.buffers:
+            active = buf is self.active_buffer
+            bg = self.COLOR_ACCENT_HOVER if active else self.COLOR_ACCENT
+            fg = self.COLOR_TEXT if active else self.COLOR_MUTED
+
+            tab = tk.Frame(self.tab_bar, bg=bg)
+            tab.pack(side=tk.LEFT, padx=(0, 2))
+
+            tk.Button(
+                tab,
+                text=buf.title,
+                command=lambda b=buf: self.switch_tab(b),
+                bg=bg,
+                fg=fg,
+                relief=tk.FLAT,
+                bd=0,
+                padx=8, pady=2
+            ).pack(side=tk.LEFT)
+
+            tk.Button(
+                tab,
+                text="×",
+                command=lambda b=buf: self.close_tab(b),
+                bg=bg,
+                fg=self.COLOR_MUTED,
+                relief=tk.FLAT,
+                bd=0,
+                padx=4, pady=2
+            ).pack(side=tk.LEFT)
+
+    def destroy(self):
+        try:
+            self.save_session()
+        except (OSError, sqlite3.Error, tk.TclError):
+            pass
+        if self._tab_cache_dir:
+            shutil.rmtree(self._tab_cache_dir, ignore_errors=True)
+        super().destroy()
+
+    # ======================================================
+    #                    SESSION RESTORE
+    # ======================================================
+    @staticmethod
+    def _file_signature(path):
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None, None
+        return st.st_mtime, st.st_size
+
+    def save_session(self):
+        tabs = []
+        for buf in self.buffers:
+            if buf is self.active_buffer:
+                text, spans, cursor, yview, modified = self._active_state()
+                data = zlib.compress(text.encode("utf-8"), 1)
+                filename, language = self._filename, self.current_language
+            else:
+                # rows are re-numbered on save, so pending tabs load first
+                if buf.loader is not None:
+                    buf.rehydrate()
+                data, spans = buf.payload()
+                cursor, yview, modified = buf.cursor, buf.yview, buf.modified
+                filename, language = buf.filename, buf.language
+
+            mtime, size = self._file_signature(filename) if filename else (None, None)
+            tabs.append({
+                "filename": filename, "language": language, "cursor": cursor,
+                "yview": yview, "modified": modified, "mtime": mtime, "size": size,
+                "data": data, "spans": spans,
+            })
+
+        if self.chunk_window and self.chunk_window.winfo_exists():
+            self.saved_chunks = [txt.get("1.0", "end-1c") for txt in self.code_chunks]
+
+        self.session.save(
+            tabs,
+            self.buffers.index(self.active_buffer),
+            self.saved_chunks,
+            self._snippet_cache
+        )
+
+    def _autosave_session(self):
+        try:
+            self.save_session()
+        except (OSError, sqlite3.Error) as e:
+            self.append_output(f"[Session] Autosave failed: {e}\n")
+        self.after(self.SESSION_AUTOSAVE_MS, self._autosave_session)
+
+    def _session_loader(self, row):
+        def load():
+            data, spans = self.session.load_payload(row["position"])
+
+            # Clean file changed on disk since the snapshot → take the disk copy
+            if row["filename"] and not row["modified"]:
+                mtime, size = self._file_signature(row["filename"])
+                if mtime is not None and (mtime, size) != (row["mtime"], row["size"]):
+                    with open(row["filename"], "r", encoding="utf-8") as f:
+                        return zlib.compress(f.read().encode("utf-8"), 1), {}, True
+
+            return data, spans, False
+
+        return load
+
+    def _restore_session(self):
+        try:
+            index = self.session.load_index()
+        except (sqlite3.Error, ValueError) as e:
+            self.append_output(f"[Session] Could not read session: {e}\n")
+            return
+        if not index:
+            return
+
+        tabs, active, self.saved_chunks, self._snippet_cache = index
+
+        buffers = []
+        for row in tabs:
+            buf = DocumentBuffer(row["filename"], row["language"])
+            buf.cursor = row["cursor"]
+            buf.yview = row["yview"]
+            buf.modified = row["modified"]
+            buf.data = None
+            buf.spans = None
+            buf.loader = self._session_loader(row)
+            buffers.append(buf)
+
+        # Visible tab first, the rest trickle in while idle
+        self.buffers = buffers
+        self.active_buffer = buffers[min(active, len(buffers) - 1)]
+        try:
+            self._load_buffer(self.active_buffer)
+        except (OSError, sqlite3.Error, UnicodeDecodeError) as e:
+            self.append_output(f"[Session] Could not restore session: {e}\n")
+            self.buffers = []
+            self.active_buffer = None
+            self._add_buffer(DocumentBuffer())
+            return
+
+        self._render_tabs()
+        self.append_output(f"Session restored ({len(buffers)} tab(s)).\n")
+        self.after(200, self._restore_next_tab)
+
+    def _restore_next_tab(self):
+        for buf in self.buffers:
+            if buf.loader is not None:
+                try:
+                    buf.rehydrate()
+                except (OSError, sqlite3.Error, UnicodeDecodeError) as e:
+                    self.append_output(f"[Session] Dropped tab '{buf.title}': {e}\n")
+                    self.buffers.remove(buf)
+                    self._render_tabs()
+                self.after_idle(self._restore_next_tab)
+                return
+
+        self._enforce_tab_budget()
+
+    # ======================================================
+    #              EXTERNAL CHANGES + DIFF RELOAD
+    # ======================================================
+    def _poll_file_changes(self):
+        # keep the watch list in step with the open tabs
+        open_paths = {b.filename for b in self.buffers if b.filename}
+        for path in set(self.watcher.known) - open_paths:
+            self.watcher.unwatch(path)
+        for path in open_paths - set(self.watcher.known):
+            self.watcher.watch(path)
+
+        for path in self.watcher.poll():
+            try:
+                self._on_external_change(path)
+            except (OSError, UnicodeDecodeError) as e:
+                self.append_output(f"[Watch] Could not reload {path}: {e}\n")
+
+        self.after(self.WATCH_POLL_MS, self._poll_file_changes)
+
+    def _on_external_change(self, path):
+        for buf in self.buffers:
+            if buf.filename != path:
+                continue
+
+            if buf is self.active_buffer:
+                if self.text.edit_modified() and not messagebox.askyesno(
+                    "File Changed",
+                    f"'{buf.title}' changed on disk.\nReload it and drop your unsaved edits?"
+                ):
+                    return
+                self.reload_from_disk()
+
+            elif buf.modified:
+                self.append_output(f"[Watch] {path} changed on disk (tab has unsaved edits, kept).\n")
+
+            else:
+                # Background tab: re-read lazily when it is shown again
+                if buf.evicted_path and os.path.exists(buf.evicted_path):
+                    os.remove(buf.evicted_path)
+                buf.evicted_path = None
+                buf.data = None
+                buf.spans = None
+                buf.loader = lambda p=path: (self._read_compressed(p), {}, True)
+                self.append_output(f"[Watch] {path} changed on disk.\n")
+            return
+
+    @staticmethod
+    def _read_compressed(path):
+        with open(path, "r", encoding="utf-8") as f:
+            return zlib.compress(f.read().encode("utf-8"), 1)
+
+    @staticmethod
+    def _tk_lines(text):
+        # Tk only breaks lines on "\n" (str.splitlines also splits on
+        # \x0c, \x85, \u2028, ... which would shift the line numbers)
+        return io.StringIO(text).readlines()
+
+    def reload_from_disk(self):
+        """Patch only the changed line ranges into the editor.
+
+        Cursor, undo history and highlighting outside the changed lines
+        are kept.
+        """
+        with open(self._filename, "r", encoding="utf-8") as f:
+            new = self._tk_lines(f.read())
+        old = self._tk_lines(self.text.get("1.0", "end-1c"))
+
+        # Skip the common head/tail before handing the middle to difflib
+        head = 0
+        limit = min(len(old), len(new))
+        while head < limit and old[head] == new[head]:
+            head += 1
+        tail = 0
+        while tail < limit - head and old[-1 - tail] == new[-1 - tail]:
+            tail += 1
+
+        matcher = difflib.SequenceMatcher(
+            None, old[head:len(old) - tail], new[head:len(new) - tail], autojunk=False
+        )
+        ops = [op for op in matcher.get_opcodes() if op[0] != "equal"]
+
+        if not ops:
+            self.text.edit_modified(False)
+            return
+
+        # Back to front, so earlier line numbers stay valid (one undo step)
+        self.undo_history.separator()
+        self.undo_history.grouped = True
+        for tag, i1, i2, j1, j2 in reversed(ops):
+            i1, i2, j1, j2 = i1 + head, i2 + head, j1 + head, j2 + head
+            if i2 > i1:
+                self.text.delete(f"{i1 + 1}.0", f"{i2 + 1}.0")
+            if j2 > j1:
+                self.text.insert(f"{i1 + 1}.0", "".join(new[j1:j2]))
+        self.undo_history.grouped = False
+        self.undo_history.separator()
+
+        # Re-highlight just the lines that came in
+        for tag, i1, i2, j1, j2 in ops:
+            if j2 > j1:
+                self._highlight_syntax(f"{j1 + head + 1}.0", f"{j2 + head + 1}.0")
+
+        self._update_line_numbers()
+        self.text.edit_modified(False)
+        self.watcher.touch(self._filename)
+        self.append_output(f"Reloaded {self._filename} ({len(ops)} changed range(s)).\n")
+
+    # ======================================================
+    #                      UNDO / REDO
+    # ======================================================
+    def _install_undo_proxy(self):
+        """Route the editor's insert/delete/replace through UndoHistory.
+
+        The Tk widget command is renamed and replaced by a small Tcl proc
+        that reports edits to Python before running them, so typing,
+        pasting and our own inserts are all seen.
+        """
+        widget = str(self.text)
+        orig = widget + "_orig"
+        self.tk.call("rename", widget, orig)
+        record = self.register(self._record_text_edit)
+
+        self.tk.eval(
+            f"proc {widget} {{args}} {{\n"
+            f"    if {{[lindex $args 0] in {{insert delete replace}}}} {{ {record} {{*}}$args }}\n"
+            f"    uplevel 1 [list {orig} {{*}}$args]\n"
+            f"}}"
+        )
+
+    def _record_text_edit(self, op, *args):
+        history = self.undo_history
+        if history.paused:
+            return
+
+        try:
+            if op == "insert":
+                index = self.text.index(args[0])
+                if index == self.text.index(tk.END):
+                    index = self.text.index("end-1c")
+                chars = "".join(args[1::2])
+                if chars:
+                    history.record("insert", index, chars)
+                return
+
+            if op == "delete" and len(args) > 2:
+                # multi-range delete: not tracked, start fresh
+                history.reset()
+                return
+
+            first = self.text.index(args[0])
+            if op == "delete" and len(args) == 1:
+                last = self.text.index(f"{first}+1c")
+            else:
+                last = self.text.index(args[1])
+            if self.text.compare(last, ">", "end-1c"):
+                last = self.text.index("end-1c")
+
+            if self.text.compare(first, "<", last):
+                history.record("delete", first, self.text.get(first, last), last)
+
+            if op == "replace":
+                chars = "".join(args[2::2])
+                if chars:
+                    history.record("insert", first, chars)
+        except tk.TclError:
+            pass  # bad index – Tk reports it when the real command runs
+
+    def _apply_unit(self, unit, reverse):
+        if not unit.edits:
+            return
+
+        self.undo_history.paused = True
+        try:
+            edits = reversed(unit.edits) if reverse else unit.edits
+            for kind, index, payload in edits:
+                text = UndoHistory.text_of(payload)
+                if (kind == "insert") == reverse:
+                    self.text.delete(index, f"{index}+{len(text)}c")
+                    cursor = index
+                else:
+                    self.text.insert(index, text)
+                    cursor = f"{index}+{len(text)}c"
+        finally:
+            self.undo_history.paused = False
+
+        self.text.mark_set(tk.INSERT, cursor)
+        self.text.see(tk.INSERT)
+        self._on_text_change()
+
+    def undo(self, event=None):
+        unit = self.undo_history.pop_undo()
+        if unit is None:
+            self.bell()
+        else:
+            self._apply_unit(unit, reverse=True)
+        return "break"
+
+    def redo(self, event=None):
+        unit = self.undo_history.pop_redo()
+        if unit is None:
+            self.bell()
+        else:
+            self._apply_unit(unit, reverse=False)
+        return "break"
+
     # ======================================================
     #                  RUN PYTHON + HTML
     # ======================================================
@@ -258,21 +1471,9 @@ class MiniIDLE(tk.Tk):
             self.append_output("Run only supports Python and HTML.\n")
 
     def _run_python(self, code):
-        temp = "__run_temp__.py"
-
-        with open(temp, "w", encoding="utf-8") as f:
-            f.write(code)
-
         def runner():
             try:
-                proc = subprocess.Popen(
-                    [sys.executable, temp],
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.STDOUT,
-                    text=True
-                )
-                for line in proc.stdout:
-                    self.append_output(line)
+                ika_core.run_python(code, self.append_output)
             except Exception as e:
                 self.append_output(f"[Python Error] {e}\n")
 
@@ -313,16 +1514,7 @@ class MiniIDLE(tk.Tk):
 
     def load_snippets(self):
         lang = self.current_language.lower()
-        folder = os.path.join(self.snippet_folder, lang)
-
-        snips = dict(self.BUILTIN_SNIPPETS.get(lang, {}))
-
-        for f in os.listdir(folder):
-            if f.endswith(".txt"):
-                with open(os.path.join(folder, f), "r", encoding="utf-8") as file:
-                    snips[f[:-4]] = file.read()
-
-        return snips
+        return ika_core.load_snippets(self.snippet_folder, lang, self._snippet_cache)
 
     def open_snippet_window(self):
         snips = self.load_snippets()
@@ -477,8 +1669,9 @@ class MiniIDLE(tk.Tk):
         if not amount:
             return
 
-        # Close old window
+        # Close old window (keeping what was typed)
         if self.chunk_window and self.chunk_window.winfo_exists():
+            self.saved_chunks = [txt.get("1.0", "end-1c") for txt in self.code_chunks]
             self.chunk_window.destroy()
 
         win = tk.Toplevel(self)
@@ -535,6 +1728,10 @@ class MiniIDLE(tk.Tk):
             )
             txt.pack(fill=tk.BOTH, expand=True)
 
+            # Restored / previous chunk contents
+            if i < len(self.saved_chunks):
+                txt.insert("1.0", self.saved_chunks[i])
+
             self.code_chunks.append(txt)
 
         # Stitch button
@@ -551,21 +1748,16 @@ class MiniIDLE(tk.Tk):
 
     def stitch_chunks(self):
         """Merge all chunks into the main editor."""
-        parts = []
-
-        for txt in self.code_chunks:
-            block = txt.get("1.0", tk.END).strip()
-            if block:
-                parts.append(block)
+        merged = ika_core.stitch_parts(txt.get("1.0", tk.END) for txt in self.code_chunks)
 
-        if not parts:
+        if not merged:
             messagebox.showinfo("Chunks", "No chunks to stitch.")
             return
 
-        merged = "\n\n".join(parts)
-
+        self.undo_history.separator()
         self.text.delete("1.0", tk.END)
         self.text.insert("1.0", merged)
+        self.undo_history.separator()
 
         self._update_line_numbers()
         self._highlight_syntax()
@@ -579,6 +1771,10 @@ class MiniIDLE(tk.Tk):
         root = tk.Frame(self, bg=self.COLOR_PANEL)
         root.pack(fill=tk.BOTH, expand=True)
 
+        # ---------------- TAB BAR ----------------
+        self.tab_bar = tk.Frame(root, bg=self.COLOR_PANEL)
+        self.tab_bar.pack(fill=tk.X, padx=8, pady=(4, 0))
+
         # ---------------- MAIN AREA ----------------
         main = tk.Frame(root, bg=self.COLOR_PANEL)
         main.pack(fill=tk.BOTH, expand=True, padx=8, pady=(4, 4))
@@ -606,13 +1802,20 @@ class MiniIDLE(tk.Tk):
             fg=self.COLOR_TEXT,
             insertbackground=self.COLOR_TEXT,
             font=self.code_font,
-            undo=True,
+            undo=False,  # UndoHistory handles undo/redo
             relief=tk.FLAT,
             border=0,
             padx=6,
             pady=4
         )
         self.text.pack(fill=tk.BOTH, expand=True)
+        self._install_undo_proxy()
+
+        # Highlight colours are set once, so spans restored from a buffer
+        # or session show up without a fresh highlight pass
+        self.text.tag_config("keyword", foreground="#5ea2ff")
+        self.text.tag_config("string", foreground="#ffcc66")
+        self.text.tag_config("tag", foreground="#66d9ef")
 
         # Scrollbar
         self.y_scroll = tk.Scrollbar(main, orient="vertical", command=self._on_scrollbar)
@@ -625,6 +1828,7 @@ class MiniIDLE(tk.Tk):
         if HtmlFrame is not None:
             self.preview_widget = HtmlFrame(self.preview_frame, messages_enabled=False)
             self.preview_widget.pack(fill=tk.BOTH, expand=True)
+            self._hook_preview_resources()
         else:
             self.preview_widget = tk.Text(
                 self.preview_frame,
@@ -663,12 +1867,146 @@ class MiniIDLE(tk.Tk):
         self.output.pack(fill=tk.X)
 
         # typing event handler
-        self.text.bind("<KeyRelease>", self._on_text_change)
+        self.text.bind("<<Undo>>", self.undo)
+        self.text.bind("<<Redo>>", self.redo)
+
+        # (looked up per event so the latency wrapper is picked up)
+        self.text.bind("<KeyRelease>", lambda e: self._on_text_change(e))
 
         # initialize
         self._update_line_numbers()
         self._update_preview_visibility()
 
+    # ======================================================
+    #                LATENCY STATS PANEL
+    # ======================================================
+    def set_latency_enabled(self, on):
+        """Wrap (or unwrap) the timed handlers on this instance."""
+        if on == self.latency.enabled:
+            return
+        self.latency.enabled = on
+
+        for name in LatencyMonitor.TIMED:
+            if on:
+                setattr(self, name, self._timed(name, getattr(self, name)))
+            else:
+                self.__dict__.pop(name, None)
+
+        self.append_output(f"Latency instrumentation {'on' if on else 'off'}.\n")
+
+    def _timed(self, name, func):
+        mon = self.latency
+
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                ms = (time.perf_counter() - start) * 1000
+                mon.record(name, ms)
+                if name == "_on_text_change" and mon.over_budget(ms):
+                    self._warn_slow_keystroke(ms)
+
+        return wrapper
+
+    def _warn_slow_keystroke(self, ms):
+        parts = []
+        for sub in ("_highlight_syntax", "_update_line_numbers"):
+            if self.latency.samples.get(sub):
+                parts.append(f"{sub} {self.latency.samples[sub][-1]:.1f} ms")
+
+        self.append_output(
+            f"[Perf] Keystroke took {ms:.1f} ms "
+            f"(budget {self.latency.frame_budget_ms:.0f} ms): {', '.join(parts)}\n"
+        )
+
+    def open_stats_window(self):
+        if self.stats_window and self.stats_window.winfo_exists():
+            self.stats_window.lift()
+            return
+
+        if not self.latency.enabled:
+            self.latency_var.set(True)
+            self.set_latency_enabled(True)
+
+        win = tk.Toplevel(self)
+        self.stats_window = win
+        win.title("Latency Stats")
+        win.geometry("560x240")
+        win.configure(bg=self.COLOR_PANEL)
+
+        label = tk.Label(
+            win,
+            bg=self.COLOR_PANEL,
+            fg=self.COLOR_TEXT,
+            font=("Consolas", 10),
+            justify=tk.LEFT,
+            anchor="nw"
+        )
+        label.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+
+        buttons = tk.Frame(win, bg=self.COLOR_PANEL)
+        buttons.pack(fill=tk.X, padx=10, pady=(0, 10))
+
+        for text, command in (("Reset", self.latency.reset), ("Export JSON...", self.export_latency_stats)):
+            tk.Button(
+                buttons,
+                text=text,
+                command=command,
+                bg=self.COLOR_ACCENT,
+                fg=self.COLOR_TEXT,
+                relief=tk.FLAT,
+                padx=10, pady=4
+            ).pack(side=tk.LEFT, padx=(0, 6))
+
+        def refresh():
+            if not win.winfo_exists():
+                return
+            label.config(text=self._format_stats())
+            win.after(500, refresh)
+
+        refresh()
+
+    def _format_stats(self):
+        h = self.undo_history
+        footer = [
+            f"Undo history: {len(h.undo_stack)} undo / {len(h.redo_stack)} redo, "
+            f"{h.memory() / 1024:.0f} KB of {h.budget / 1024:.0f} KB"
+            f"{f', {h.evicted} evicted' if h.evicted else ''}"
+        ]
+        if HtmlFrame:
+            c = self.preview_cache.report()
+            footer.append(
+                f"Preview cache: {c['hits']} hit / {c['misses']} miss last refresh "
+                f"({c['hit_rate_pct']:.0f}%), ~{c['saved_ms']:.1f} ms saved, "
+                f"{c['cached_bytes'] / 1024:.0f} KB cached"
+            )
+
+        stats = self.latency.stats()
+        if not stats:
+            return "\n".join(["No samples yet – start typing.", ""] + footer)
+
+        lines = [f"{'handler':<24}{'calls':>7}{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"]
+        for name, s in stats.items():
+            lines.append(
+                f"{name:<24}{s['calls']:>7}{s['p50_ms']:>9.2f}"
+                f"{s['p95_ms']:>9.2f}{s['p99_ms']:>9.2f}{s['max_ms']:>9.2f}"
+            )
+        lines.append(f"\n(ms, last {self.latency.window} calls, frame budget {self.latency.frame_budget_ms:.0f} ms)")
+        lines.extend(footer)
+        return "\n".join(lines)
+
+    def export_latency_stats(self):
+        path = filedialog.asksaveasfilename(
+            defaultextension=".json",
+            filetypes=[("JSON", "*.json")]
+        )
+        if not path:
+            return
+
+        self.latency.dump(path, {"preview_cache": self.preview_cache.report()})
+        self.append_output(f"Latency stats saved: {path}\n")
+
     # ======================================================
     #                   LANGUAGE SELECTOR
     # ======================================================
@@ -728,12 +2066,16 @@ class MiniIDLE(tk.Tk):
         filemenu.add_separator()
         filemenu.add_command(label="Save", command=self.save_file)
         filemenu.add_command(label="Save As...", command=self.save_file_as)
+        filemenu.add_command(label="Close Tab", command=self.close_tab)
         filemenu.add_separator()
         filemenu.add_command(label="Exit", command=self.destroy)
         menubar.add_cascade(label="File", menu=filemenu)
 
         # EDIT
         editmenu = tk.Menu(menubar, tearoff=0)
+        editmenu.add_command(label="Undo", command=self.undo)
+        editmenu.add_command(label="Redo", command=self.redo)
+        editmenu.add_separator()
         editmenu.add_command(label="Add Snippet", command=self.add_snippet)
         editmenu.add_command(label="Snippet Library", command=self.open_snippet_window)
         editmenu.add_separator()
@@ -746,6 +2088,14 @@ class MiniIDLE(tk.Tk):
         toolsmenu.add_separator()
         toolsmenu.add_command(label="Image Manager", command=self.open_image_manager)
         toolsmenu.add_command(label="Language Selector", command=self.open_language_selector)
+        toolsmenu.add_separator()
+        self.latency_var = tk.BooleanVar(value=False)
+        toolsmenu.add_checkbutton(
+            label="Latency Instrumentation",
+            variable=self.latency_var,
+            command=lambda: self.set_latency_enabled(self.latency_var.get())
+        )
+        toolsmenu.add_command(label="Latency Stats", command=self.open_stats_window)
         menubar.add_cascade(label="Tools", menu=toolsmenu)
 
         # HELP
@@ -0,0 +1,128 @@
+"""Headless IKA: stitch chunks, expand snippets and run scripts in batch.
+
+    python ika_cli.py stitch chunks/login chunks/signup -o build
+    python ika_cli.py expand templates/*.html -o build
+    python ika_cli.py run tools/*.py -j 4
+
+Uses the same core as the editor (ika_core) and never imports tkinter.
+"""
+import os, sys, argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import ika_core
+
+
+# ======================================================
+#                  JOBS (run in workers)
+# ======================================================
+def stitch_job(folder, out_dir, ext):
+    merged = ika_core.stitch_folder(folder)
+    if not merged:
+        return 1, f"[!] No chunks in {folder}\n"
+
+    name = os.path.basename(os.path.normpath(folder)) + ext
+    dest = os.path.join(out_dir, name)
+    with open(dest, "w", encoding="utf-8") as f:
+        f.write(merged)
+    return 0, f"[✓] Stitched {folder} → {dest}\n"
+
+
+def expand_job(template, out_dir, snippet_folder):
+    lang = ika_core.language_for(template).lower()
+    snips = ika_core.load_snippets(snippet_folder, lang)
+
+    with open(template, "r", encoding="utf-8") as f:
+        text, missing = ika_core.expand_snippets(f.read(), snips)
+
+    dest = os.path.join(out_dir, os.path.basename(template))
+    with open(dest, "w", encoding="utf-8") as f:
+        f.write(text)
+
+    if missing:
+        return 1, f"[!] {template}: unknown snippet(s) {', '.join(sorted(set(missing)))}\n"
+    return 0, f"[✓] Expanded {template} → {dest}\n"
+
+
+def run_job(script):
+    lines = [f"=== {script} ===\n"]
+    try:
+        code = ika_core.run_script(script, lines.append)
+    except Exception as e:
+        return 1, "".join(lines) + f"[Python Error] {e}\n"
+    if code:
+        lines.append(f"[exit code {code}]\n")
+    return code, "".join(lines)
+
+
+# ======================================================
+#                       DISPATCH
+# ======================================================
+def _safe(func, item, *extra):
+    try:
+        return func(item, *extra)
+    except (OSError, UnicodeDecodeError) as e:
+        return 1, f"[ERROR] {item}: {e}\n"
+
+
+def run_jobs(func, inputs, jobs, *extra):
+    """Run func(input, *extra) for every input, printing results in order."""
+    if jobs == 1 or len(inputs) == 1:
+        return _report(_safe(func, item, *extra) for item in inputs)
+
+    with ProcessPoolExecutor(max_workers=min(jobs, len(inputs))) as pool:
+        futures = [pool.submit(_safe, func, item, *extra) for item in inputs]
+        return _report(f.result() for f in futures)
+
+
+def _report(results):
+    failed = 0
+    for code, text in results:
+        sys.stdout.write(text)
+        sys.stdout.flush()
+        failed += bool(code)
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="ika", description="Headless IKA tools.")
+    parser.add_argument("-j", "--jobs", type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+
+    # -j is also accepted after the subcommand; SUPPRESS keeps the value
+    # given before it (or the default) when it is not repeated there
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("-j", "--jobs", type=int, default=argparse.SUPPRESS,
+                        help="worker processes (default: CPU count)")
+
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("stitch", parents=[common], help="stitch each folder of chunk files into one file")
+    p.add_argument("folders", nargs="+")
+    p.add_argument("-o", "--out-dir", default=".")
+    p.add_argument("--ext", default=".py", help="extension of the stitched file (default .py)")
+
+    p = sub.add_parser("expand", parents=[common], help="replace {{snippet}} placeholders in templates")
+    p.add_argument("templates", nargs="+")
+    p.add_argument("-o", "--out-dir", default="expanded")
+    p.add_argument("--snippets", default=os.path.join(os.getcwd(), "snippets"),
+                   help="snippet folder (default ./snippets, same as the editor)")
+
+    p = sub.add_parser("run", parents=[common], help="run Python scripts with editor-style output capture")
+    p.add_argument("scripts", nargs="+")
+
+    args = parser.parse_args(argv)
+    jobs = max(1, args.jobs)
+
+    if args.command == "stitch":
+        os.makedirs(args.out_dir, exist_ok=True)
+        return run_jobs(stitch_job, args.folders, jobs, args.out_dir, args.ext)
+
+    if args.command == "expand":
+        os.makedirs(args.out_dir, exist_ok=True)
+        return run_jobs(expand_job, args.templates, jobs, args.out_dir, args.snippets)
+
+    return run_jobs(run_job, args.scripts, jobs)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
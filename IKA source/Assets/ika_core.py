@@ -0,0 +1,133 @@
+"""Core editor logic shared by the IKA window and the headless CLI.
+
+Nothing in here may import tkinter / tkinterweb – the CLI relies on that
+to start quickly without a display.
+"""
+import os, sys, subprocess, re
+
+
+# ======================================================
+#                   BUILT-IN SNIPPETS
+# ======================================================
+BUILTIN_SNIPPETS = {
+    "python": {
+        "forloop": "for i in range():\n    pass\n",
+        "func": "def function_name():\n    pass\n",
+        "class": "class NewClass:\n    def __init__(self):\n        pass\n"
+    },
+    "html": {
+        "div": "<div></div>",
+        "h1": "<h1>Title</h1>",
+        "button": "<button>Click</button>",
+        "page": (
+            "<!DOCTYPE html>\n<html>\n<head>\n<title>New Page</title>\n</head>\n"
+            "<body>\n\n</body>\n</html>"
+        )
+    }
+}
+
+
+def language_for(path):
+    """Editor language for a file name (same rule as open_file)."""
+    return "HTML" if path.endswith(".html") else "Python"
+
+
+# ======================================================
+#                     CHUNK STITCHING
+# ======================================================
+def stitch_parts(blocks):
+    """Strip each chunk, drop empty ones and join with a blank line."""
+    return "\n\n".join(b.strip() for b in blocks if b.strip())
+
+
+def stitch_folder(folder):
+    """Stitch every chunk file in a folder (sorted by name)."""
+    blocks = []
+    for name in sorted(os.listdir(folder)):
+        path = os.path.join(folder, name)
+        if os.path.isfile(path):
+            with open(path, "r", encoding="utf-8") as f:
+                blocks.append(f.read())
+    return stitch_parts(blocks)
+
+
+# ======================================================
+#                     SNIPPET LIBRARY
+# ======================================================
+def load_snippets(snippet_folder, lang, cache=None):
+    """Built-in + user snippets for a language ("python" / "html").
+
+    User snippets are the .txt files in snippet_folder/lang. When a cache
+    dict is passed the files are only re-read if a name, mtime or size
+    changed since last time.
+    """
+    folder = os.path.join(snippet_folder, lang)
+    snips = dict(BUILTIN_SNIPPETS.get(lang, {}))
+
+    if not os.path.isdir(folder):
+        return snips
+
+    entries = [e for e in os.scandir(folder) if e.name.endswith(".txt")]
+    signature = tuple(sorted(
+        (e.name, e.stat().st_mtime_ns, e.stat().st_size) for e in entries
+    ))
+
+    cached = cache.get(lang) if cache is not None else None
+    if cached and cached[0] == signature:
+        user_snips = cached[1]
+    else:
+        user_snips = {}
+        for e in entries:
+            with open(e.path, "r", encoding="utf-8") as file:
+                user_snips[e.name[:-4]] = file.read()
+        if cache is not None:
+            cache[lang] = (signature, user_snips)
+
+    snips.update(user_snips)
+    return snips
+
+
+SNIPPET_PLACEHOLDER = re.compile(r"\{\{\s*([\w\-]+)\s*\}\}")
+
+
+def expand_snippets(template, snips):
+    """Replace {{name}} placeholders with snippet text.
+
+    Returns (text, missing names). Unknown placeholders are left as-is.
+    """
+    missing = []
+
+    def sub(match):
+        name = match.group(1)
+        if name in snips:
+            return snips[name]
+        missing.append(name)
+        return match.group(0)
+
+    return SNIPPET_PLACEHOLDER.sub(sub, template), missing
+
+
+# ======================================================
+#                       RUN PYTHON
+# ======================================================
+def run_script(path, on_output):
+    """Run a Python file, streaming stdout+stderr lines to on_output.
+
+    Returns the exit code.
+    """
+    proc = subprocess.Popen(
+        [sys.executable, path],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True
+    )
+    for line in proc.stdout:
+        on_output(line)
+    return proc.wait()
+
+
+def run_python(code, on_output, temp="__run_temp__.py"):
+    """Write code to a temp script and run it (the editor's Run)."""
+    with open(temp, "w", encoding="utf-8") as f:
+        f.write(code)
+    return run_script(temp, on_output)
@@ -0,0 +1,326 @@
+import os
+import sys
+import json
+import time
+import select
+import shutil
+import argparse
+import platform
+import tempfile
+import subprocess
+import statistics
+import importlib.util
+from pathlib import Path
+
+print("=== IKA BENCHMARK ===")
+
+# ---------------------------------------------------------
+# 1. Locate the editor
+# ---------------------------------------------------------
+HERE = Path(__file__).resolve().parent
+APP_PATH = HERE.parent / "Assets" / "Fysonworks IKA.py"
+
+DEFAULT_RESULTS = HERE / "bench_results.json"
+DEFAULT_BASELINE = HERE / "bench_baseline.json"
+
+# A case is a regression when its median is this much slower than baseline
+REGRESSION_THRESHOLD = 0.10
+
+# Seconds to wait for Xvfb to report its display
+XVFB_TIMEOUT = 15
+
+
+# ---------------------------------------------------------
+# 2. Virtual display (Linux without $DISPLAY)
+# ---------------------------------------------------------
+def start_virtual_display():
+    """Start Xvfb when there is no display. Returns the process (or None)."""
+    if sys.platform.startswith(("win", "darwin")) or os.environ.get("DISPLAY"):
+        return None
+
+    xvfb = shutil.which("Xvfb")
+    if not xvfb:
+        print("[ERROR] No $DISPLAY and Xvfb is not installed.")
+        sys.exit(2)
+
+    # -displayfd: Xvfb picks a free display itself and writes its number
+    # to the pipe once the server is ready to accept clients
+    read_fd, write_fd = os.pipe()
+    proc = subprocess.Popen(
+        [xvfb, "-displayfd", str(write_fd), "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        pass_fds=(write_fd,)
+    )
+    os.close(write_fd)
+
+    number = b""
+    deadline = time.monotonic() + XVFB_TIMEOUT
+    try:
+        while not number.endswith(b"\n"):
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([read_fd], [], [], remaining)[0]:
+                break
+            chunk = os.read(read_fd, 16)
+            if not chunk:  # Xvfb exited
+                break
+            number += chunk
+    finally:
+        os.close(read_fd)
+
+    if not number.strip().isdigit():
+        proc.kill()
+        print("[ERROR] Xvfb did not start (no display reported).")
+        sys.exit(2)
+
+    display = f":{number.strip().decode()}"
+    os.environ["DISPLAY"] = display
+    print(f"[*] Xvfb started on {display}")
+    return proc
+
+
+def load_ika():
+    sys.path.insert(0, str(APP_PATH.parent))  # for ika_core
+    spec = importlib.util.spec_from_file_location("fysonworks_ika", APP_PATH)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+# ---------------------------------------------------------
+# 3. Benchmark cases
+# ---------------------------------------------------------
+PY_LINE = "def f{i}(x):  # comment with 'quotes' and \"strings\"\n"
+HTML_LINE = '<div class="row"><img src="assets/pic{i}.png"><p>Line {i}</p></div>\n'
+
+
+def make_source(lines, template):
+    return "".join(template.format(i=i) for i in range(lines))
+
+
+def bench_open_file(ika, app, workdir, lines):
+    path = workdir / f"open_{lines}.py"
+    path.write_text(make_source(lines, PY_LINE), encoding="utf-8")
+    ika.filedialog.askopenfilename = lambda **kw: str(path)
+
+    def setup():
+        # an already-open file only switches tabs, so close it first
+        for buf in list(app.buffers):
+            if buf.filename == str(path):
+                app.close_tab(buf, ask=False)
+
+    def run():
+        app.open_file()
+        app.update_idletasks()
+
+    return run, setup
+
+
+def bench_tab_switch(ika, app, workdir, tabs, lines):
+    opened = []
+    for i in range(tabs):
+        path = workdir / f"tab_{i}.py"
+        path.write_text(make_source(lines, PY_LINE), encoding="utf-8")
+        ika.filedialog.askopenfilename = lambda **kw: str(path)
+        app.open_file()
+        opened.append(app.active_buffer)
+
+    def run():
+        for buf in opened:
+            app.switch_tab(buf)
+            app.update_idletasks()
+
+    return run
+
+
+def bench_keystrokes(ika, app, workdir, lines, keys=50):
+    def setup():
+        app.current_language = "Python"
+        app.text.delete("1.0", "end")
+        app.text.insert("1.0", make_source(lines, PY_LINE))
+        app._on_text_change()
+        app.text.mark_set("insert", "end-1c")
+
+    def run():
+        for ch in ("x = 1\n" * keys)[:keys]:
+            app.text.insert("insert", ch)
+            app._on_text_change()
+            app.update_idletasks()
+
+    return run, setup
+
+
+def bench_stitch(ika, app, workdir, chunks, lines_per_chunk=40):
+    import tkinter as tk
+
+    holder = tk.Toplevel(app)
+    holder.withdraw()
+    block = make_source(lines_per_chunk, PY_LINE)
+    widgets = []
+    for _ in range(chunks):
+        txt = tk.Text(holder)
+        txt.insert("1.0", block)
+        widgets.append(txt)
+
+    def run():
+        app.code_chunks = widgets
+        app.stitch_chunks()
+        app.update_idletasks()
+
+    return run
+
+
+def bench_output_stream(ika, app, workdir, lines):
+    payload = [f"[{i:06d}] program output line\n" for i in range(lines)]
+
+    def setup():
+        app.output.config(state="normal")
+        app.output.delete("1.0", "end")
+        app.output.config(state="disabled")
+
+    def run():
+        for line in payload:
+            app.append_output(line)
+        app.update_idletasks()
+
+    return run, setup
+
+
+def bench_html_preview(ika, app, workdir, lines):
+    def setup():
+        app.current_language = "HTML"
+        app.text.delete("1.0", "end")
+        app.text.insert("1.0", make_source(lines, HTML_LINE))
+
+    def run():
+        app._update_html_preview()
+        app.update_idletasks()
+
+    return run, setup
+
+
+def cases(quick):
+    sizes = (1000, 5000) if quick else (1000, 10000, 50000)
+    for n in sizes:
+        yield f"open_file[{n}]", bench_open_file, {"lines": n}
+    for n in sizes[:2]:
+        yield f"keystrokes_50[{n}]", bench_keystrokes, {"lines": n}
+    yield f"tab_switch[8x{sizes[0]}]", bench_tab_switch, {"tabs": 8, "lines": sizes[0]}
+    yield "stitch_chunks[20]", bench_stitch, {"chunks": 20}
+    yield f"output_stream[{sizes[1]}]", bench_output_stream, {"lines": sizes[1]}
+    yield f"html_preview[{sizes[0]}]", bench_html_preview, {"lines": sizes[0]}
+
+
+# ---------------------------------------------------------
+# 4. Runner
+# ---------------------------------------------------------
+def run_case(build, ika, app, workdir, repeat, **params):
+    made = build(ika, app, workdir, **params)
+    run, setup = made if isinstance(made, tuple) else (made, None)
+
+    timings = []
+    for _ in range(repeat):
+        if setup:
+            setup()
+            app.update_idletasks()
+        start = time.perf_counter()
+        run()
+        timings.append((time.perf_counter() - start) * 1000)
+
+    return {
+        "median_ms": round(statistics.median(timings), 3),
+        "min_ms": round(min(timings), 3),
+        "mean_ms": round(statistics.mean(timings), 3),
+        "runs": repeat,
+    }
+
+
+def run_all(repeat, quick):
+    ika = load_ika()
+    workdir = Path(tempfile.mkdtemp(prefix="ika_bench_"))
+    old_cwd = os.getcwd()
+    os.chdir(workdir)  # keeps snippets/ and temp files out of the repo
+
+    results = {}
+    app = ika.MiniIDLE()
+    app.withdraw()
+    try:
+        for name, build, params in cases(quick):
+            print(f"[*] {name} ...", end=" ", flush=True)
+            results[name] = run_case(build, ika, app, workdir, repeat, **params)
+            print(f"{results[name]['median_ms']:.1f} ms")
+    finally:
+        app.destroy()
+        os.chdir(old_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return results
+
+
+# ---------------------------------------------------------
+# 5. Baseline comparison
+# ---------------------------------------------------------
+def compare(results, baseline_path):
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+
+    regressions = []
+    print(f"\n{'case':<26}{'baseline':>11}{'now':>11}{'change':>9}")
+    for name, res in results.items():
+        old = baseline.get(name)
+        if not old:
+            print(f"{name:<26}{'-':>11}{res['median_ms']:>11.1f}{'new':>9}")
+            continue
+        change = (res["median_ms"] - old["median_ms"]) / old["median_ms"]
+        flag = "  <-- REGRESSION" if change > REGRESSION_THRESHOLD else ""
+        print(f"{name:<26}{old['median_ms']:>11.1f}{res['median_ms']:>11.1f}{change:>+9.0%}{flag}")
+        if flag:
+            regressions.append(name)
+
+    return regressions
+
+
+# ---------------------------------------------------------
+# MAIN
+# ---------------------------------------------------------
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark IKA's editor hot paths.")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per case (default 5)")
+    parser.add_argument("--quick", action="store_true", help="smaller inputs")
+    parser.add_argument("--output", default=str(DEFAULT_RESULTS), help="results JSON file")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="baseline JSON to compare with")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the new baseline")
+    args = parser.parse_args()
+
+    xvfb = start_virtual_display()
+    try:
+        results = run_all(args.repeat, args.quick)
+    finally:
+        if xvfb:
+            xvfb.terminate()
+
+    report = {
+        "created": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n[✓] Results written: {args.output}")
+
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"[✓] Baseline saved: {args.baseline}")
+        sys.exit(0)
+
+    if os.path.exists(args.baseline):
+        regressions = compare(results, args.baseline)
+        if regressions:
+            print(f"\n[!] {len(regressions)} regression(s): {', '.join(regressions)}")
+            sys.exit(1)
+        print("\n[✓] No regressions.")
+    else:
+        print("[*] No baseline yet – run with --save-baseline to create one.")
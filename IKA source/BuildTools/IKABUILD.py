@@ -12,6 +12,7 @@ DOWNLOADS = Path.home() / "Downloads"
 print(f"[*] Downloads folder found: {DOWNLOADS}")
 
 APP_NAME = DOWNLOADS / "Fysonworks IKA.py"
+CORE_MODULE = DOWNLOADS / "ika_core.py"  # imported by the app, must sit next to it
 PNG_ICON = DOWNLOADS / "ioc.png"
 ICO_ICON = DOWNLOADS / "Ika.ico"
 
@@ -41,6 +42,10 @@ def build_exe():
         print(f"[ERROR] Could not find your app: {APP_NAME}")
         return
 
+    if not CORE_MODULE.exists():
+        print(f"[ERROR] Could not find {CORE_MODULE} (copy it next to the app)")
+        return
+
     cmd = [
         "python",
         "-m", "PyInstaller",